@@ -0,0 +1,84 @@
+import os
+import struct
+import sqlite3
+from pybloom_live import ScalableBloomFilter
+
+DB_FILE = "jobs.db"
+# Filtro de Bloom salvo ao lado do banco. Ele responde "com certeza é nova"
+# sem consultar o SQLite e sem carregar todos os links na memória.
+BLOOM_FILE = "jobs.bloom"
+
+
+def setup_database():
+    """
+    Abre a conexão com o banco, cria a tabela de vagas se não existir
+    e devolve a conexão para ser reaproveitada durante toda a execução.
+    """
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+    # WAL + synchronous=NORMAL evitam um fsync do journal a cada commit.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # A tabela 'jobs' terá uma coluna 'link' que é a chave primária.
+    # Isso garante que cada link seja único no banco de dados.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            link TEXT PRIMARY KEY
+        )
+    ''')
+    conn.commit()
+    print("Banco de dados configurado com sucesso.")
+    return conn
+
+
+def links_in_db(conn, links):
+    """Devolve, em uma única consulta, quais dos links já existem no banco."""
+    if not links:
+        return set()
+    # Um '?' por link, para evitar injeção de SQL
+    placeholders = ",".join("?" * len(links))
+    cursor = conn.execute(
+        f"SELECT link FROM jobs WHERE link IN ({placeholders})", links
+    )
+    return {row[0] for row in cursor}
+
+
+def load_bloom(conn):
+    """
+    Carrega o filtro de Bloom salvo em disco. Se o arquivo não existir
+    (primeira execução, por exemplo) ou estiver corrompido, reconstrói o
+    filtro a partir do banco.
+    """
+    if os.path.exists(BLOOM_FILE):
+        try:
+            with open(BLOOM_FILE, "rb") as f:
+                return ScalableBloomFilter.fromfile(f)
+        except (OSError, EOFError, struct.error, ValueError) as e:
+            print(f"Filtro de Bloom ilegível ({e!r}). Reconstruindo a partir do banco...")
+
+    bloom = ScalableBloomFilter(initial_capacity=10_000, error_rate=0.001)
+    for (link,) in conn.execute("SELECT link FROM jobs"):
+        bloom.add(link)
+    return bloom
+
+
+def save_bloom(bloom):
+    """Salva o filtro de Bloom em disco para a próxima execução."""
+    # Grava em um arquivo temporário e só então troca pelo definitivo, para
+    # que uma falha no meio da escrita nunca deixe o filtro pela metade.
+    tmp_file = BLOOM_FILE + ".tmp"
+    with open(tmp_file, "wb") as f:
+        bloom.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, BLOOM_FILE)
+
+
+def add_jobs_to_db(conn, links):
+    """Adiciona vários links de vagas ao banco em uma única transação."""
+    # Usamos 'INSERT OR IGNORE' para que, se o link já existir, o comando
+    # seja simplesmente ignorado sem causar um erro.
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO jobs (link) VALUES (?)",
+            [(link,) for link in links],
+        )
@@ -0,0 +1,157 @@
+import time
+import asyncio
+import httpx
+
+# Quantos envios ao Discord podem estar em andamento ao mesmo tempo.
+# O bucket de um webhook aceita cerca de 5 requisições a cada 2 segundos.
+DISCORD_MAX_CONCURRENCY = 5
+# Quantas vagas vão em cada mensagem (o Discord aceita até 10 embeds por POST).
+DISCORD_MAX_EMBEDS = 10
+# Quantas vezes tentar de novo um envio que recebeu 429 (rate limit),
+# um erro 5xx ou uma falha de rede.
+DISCORD_MAX_RETRIES = 5
+DISCORD_RETRY_STATUSES = {500, 502, 503, 504}
+DISCORD_BACKOFF_FACTOR = 0.3
+# Quantas vezes o transporte HTTP refaz uma tentativa de conexão que falhou.
+DISCORD_CONNECT_RETRIES = 3
+
+# Partes fixas das mensagens enviadas ao Discord.
+DISCORD_MESSAGE_HEADER = "**🍞 OPAAA - Chegando vagas fresquinhas**"
+LOCATION_FIELD_NAME = "📍 Local"
+WORK_MODEL_FIELD_NAME = "🏢 Modelo"
+
+
+def _field_value(value):
+    # O Discord rejeita (400) o POST inteiro se um campo vier vazio ou
+    # passar de 1024 caracteres, então o valor é sempre preenchido e cortado.
+    return (value or "Não informado")[:1024]
+
+
+def build_embed(job):
+    # Monta o embed do Discord para uma vaga: título com link para a vaga
+    # e os campos de local e modelo de trabalho lado a lado.
+    return {
+        "title": job["title"][:256],
+        "url": job["link"],
+        "fields": [
+            {"name": LOCATION_FIELD_NAME, "value": _field_value(job["location"]), "inline": True},
+            {"name": WORK_MODEL_FIELD_NAME, "value": _field_value(job["work_model"]), "inline": True},
+        ],
+    }
+
+
+def build_payloads(vagas):
+    """
+    Agrupa as vagas em mensagens de até DISCORD_MAX_EMBEDS embeds cada,
+    para gastar uma requisição do rate limit por grupo e não por vaga.
+    Devolve pares (vagas do grupo, payload).
+    """
+    for i in range(0, len(vagas), DISCORD_MAX_EMBEDS):
+        grupo = vagas[i:i + DISCORD_MAX_EMBEDS]
+        payload = {
+            "content": DISCORD_MESSAGE_HEADER,
+            "embeds": [build_embed(v) for v in grupo],
+        }
+        yield grupo, payload
+
+
+class DiscordRateLimiter:
+    """
+    Estado de rate limit compartilhado por todos os envios ao mesmo webhook.
+    Quando o Discord avisa que o bucket esgotou (ou responde 429), nenhum
+    envio sai antes do horário liberado, não só o que recebeu o aviso.
+    """
+
+    def __init__(self):
+        self._not_before = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        """Espera até que seja permitido fazer o próximo POST."""
+        async with self._lock:
+            while (delay := self._not_before - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+
+    def defer(self, seconds):
+        """Adia todos os próximos envios por 'seconds' segundos a partir de agora."""
+        self._not_before = max(self._not_before, time.monotonic() + seconds)
+
+
+def _parse_seconds(value, default):
+    """Converte um header de tempo do Discord em segundos, com valor padrão se vier inválido."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def open_discord_client():
+    """
+    Cria o cliente HTTP usado para todos os envios ao Discord.
+    Deve ser usado com 'async with'.
+    """
+    # Com HTTP/2 todos os envios simultâneos compartilham uma única conexão
+    # TLS com o Discord, em vez de abrir uma conexão por requisição.
+    # O pool fica bem maior que a concorrência para que nunca seja ele o
+    # gargalo, e o transporte refaz sozinho tentativas de conexão que falharem.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=DISCORD_CONNECT_RETRIES,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+    return httpx.AsyncClient(transport=transport, timeout=10.0)
+
+
+async def send_to_discord(session, sem, limiter, webhook_url, payload):
+    # Envia um payload ao Discord usando a sessão compartilhada.
+    # O semáforo limita quantos envios rodam em paralelo e o limiter
+    # segura todos eles enquanto o bucket do webhook estiver esgotado.
+    async with sem:
+        for tentativa in range(DISCORD_MAX_RETRIES + 1):
+            backoff = DISCORD_BACKOFF_FACTOR * 2 ** tentativa
+            await limiter.wait()
+            # O Discord espera um request POST com um corpo em JSON.
+            try:
+                response = await session.post(webhook_url, json=payload)
+            except httpx.TransportError as e:
+                # Falhas de rede (timeout, conexão caída) também são
+                # transitórias: tenta de novo com back-off em vez de
+                # derrubar os outros envios.
+                if tentativa < DISCORD_MAX_RETRIES:
+                    await asyncio.sleep(backoff)
+                    continue
+                print(f"Falha ao enviar para o Discord: {e!r}")
+                return False
+            status = response.status_code
+            headers = response.headers
+
+            # Se o bucket do webhook esgotou, agenda o próximo envio
+            # (de qualquer tarefa) para quando ele for renovado.
+            if headers.get("X-RateLimit-Remaining") == "0":
+                limiter.defer(
+                    _parse_seconds(headers.get("X-RateLimit-Reset-After"), 1.0)
+                )
+
+            # Status 204 indica sucesso para o Discord.
+            if status == 204:
+                print("Mensagem enviada com sucesso para o Discord!")
+                return True
+
+            # 429 significa rate limit: espera o tempo pedido pelo Discord
+            # (ou um back-off exponencial, o que for maior) e tenta de novo.
+            if status == 429 and tentativa < DISCORD_MAX_RETRIES:
+                espera = min(2 ** tentativa, 30)
+                espera = max(_parse_seconds(headers.get("Retry-After"), espera), espera)
+                print(f"Rate limit do Discord atingido. Tentando de novo em {espera:.1f}s...")
+                limiter.defer(espera)
+                continue
+
+            # Erros 5xx do Discord costumam ser passageiros: tenta de novo
+            # com um back-off exponencial curto.
+            if status in DISCORD_RETRY_STATUSES and tentativa < DISCORD_MAX_RETRIES:
+                await asyncio.sleep(backoff)
+                continue
+
+            # Se ocorrer uma falha, exibe o código de status para depuração.
+            print(f"Falha ao enviar para o Discord. Status: {status}")
+            return False
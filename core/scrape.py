@@ -0,0 +1,345 @@
+import re
+import json
+import httpx
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from selectolax.lexbor import LexborHTMLParser
+
+# URL de busca da Gupy usada pelo navegador.
+GUPY_URL = "https://portal.gupy.io/job-search/term=python"
+# API JSON que o próprio portal usa para montar a lista de vagas.
+# Consultar ela direto dispensa abrir o navegador.
+GUPY_API_URL = "https://employability-portal.gupy.io/api/v1/jobs"
+GUPY_SEARCH_TERM = "python"
+# Uma única requisição traz as 50 vagas que o navegador levaria 5 páginas
+# para mostrar.
+GUPY_API_PAGE_SIZE = 50
+
+# Só o texto da lista de vagas interessa, então o navegador não precisa
+# baixar nem renderizar imagens, fontes, mídia, CSS ou scripts de analytics.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_HOSTS = ("googletagmanager", "google-analytics", "hotjar", "segment")
+
+# Flags do Chromium para rodar headless com menos CPU e memória.
+CHROMIUM_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-blink-features=AutomationControlled",
+    "--mute-audio",
+]
+
+# Condições avaliadas no navegador para saber quando a lista de vagas
+# terminou de renderizar (na primeira página e depois de cada clique).
+# A troca de página é detectada pelo conjunto de links das vagas, e não só
+# pela primeira vaga, que pode se repetir (vaga fixada ou sobreposição).
+WAIT_JS = "() => document.querySelectorAll('main#main-content ul li').length > 0"
+JOB_LINKS_JS = (
+    "() => Array.from(document.querySelectorAll('main#main-content ul li a[href]'),"
+    " a => a.getAttribute('href')).join(' ')"
+)
+PAGE_CHANGED_JS = (
+    f"(anterior) => {{ const atual = ({JOB_LINKS_JS})();"
+    " return atual !== '' && atual !== anterior; }"
+)
+
+# O Next.js embute os dados da página renderizada pelo servidor neste script.
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S
+)
+
+# Seletores CSS usados para extrair os dados de cada vaga do HTML.
+JOB_LIST_SELECTOR = "main#main-content ul"
+LOCATION_SELECTOR = 'span[data-testid="job-location"]'
+WORK_MODEL_SELECTOR = 'div[aria-label^="Modelo de trabalho"] span'
+
+# Tradução do campo 'workplaceType' da API para o texto exibido no portal.
+WORK_MODELS = {
+    "remote": "Remoto",
+    "hybrid": "Híbrido",
+    "on-site": "Presencial",
+}
+
+
+def _is_job_list(jobs):
+    """
+    Confere se 'jobs' tem o formato de vagas da Gupy que o script conhece:
+    uma lista de dicionários com 'name' e 'jobUrl' em texto.
+    """
+    return isinstance(jobs, list) and all(
+        isinstance(job, dict)
+        and isinstance(job.get("name"), str)
+        and isinstance(job.get("jobUrl"), str)
+        and job["jobUrl"]
+        for job in jobs
+    )
+
+
+def _vaga_from_api_job(job):
+    """Converte uma vaga no formato da API da Gupy no dicionário usado pelo script."""
+    location = ", ".join(
+        part for part in (job.get("city"), job.get("state"))
+        if isinstance(part, str) and part
+    )
+    workplace_type = job.get("workplaceType")
+    return {
+        "title": job["name"],
+        "link": job["jobUrl"],
+        "location": location or "Não informado",
+        "work_model": WORK_MODELS.get(workplace_type, "Não informado")
+        if isinstance(workplace_type, str) else "Não informado",
+    }
+
+
+async def scrape_gupy_api(term, queue, max_jobs=50):
+    """
+    Busca as vagas direto na API JSON da Gupy, sem navegador, e coloca
+    cada página de vagas na fila assim que ela chega.
+    Se a primeira página falhar (API fora do ar ou com outro formato),
+    levanta a exceção para que quem chamou possa cair no Playwright.
+
+    :param term: O termo de busca.
+    :param queue: A fila onde cada lote de vagas é colocado.
+    :param max_jobs: O número máximo de vagas para buscar.
+    """
+    print("Buscando vagas na API da Gupy...")
+    # Links já vistos nesta execução, caso a paginação repita alguma vaga.
+    seen_this_run = set()
+
+    async with httpx.AsyncClient(http2=True, timeout=30.0) as client:
+        for page_count, offset in enumerate(range(0, max_jobs, GUPY_API_PAGE_SIZE)):
+            limit = min(GUPY_API_PAGE_SIZE, max_jobs - offset)
+            try:
+                response = await client.get(
+                    GUPY_API_URL,
+                    params={"jobName": term, "limit": limit, "offset": offset},
+                )
+                response.raise_for_status()
+                jobs = response.json()["data"]
+                if not _is_job_list(jobs):
+                    raise ValueError("Resposta da API da Gupy em formato inesperado")
+                lote = [_vaga_from_api_job(job) for job in jobs]
+            except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+                if page_count == 0:
+                    raise
+                # As páginas anteriores já foram enviadas para a fila,
+                # então só paramos por aqui com o que já foi coletado.
+                print(f"Erro ao buscar a página {page_count + 1} na API: {e!r}")
+                break
+
+            print(f"Página {page_count + 1}: {len(jobs)} vagas recebidas da API.")
+            vagas_da_pagina = []
+            for vaga in lote:
+                if vaga["link"] in seen_this_run:
+                    continue
+                seen_this_run.add(vaga["link"])
+                vagas_da_pagina.append(vaga)
+            await queue.put(vagas_da_pagina)
+
+            # Uma página incompleta significa que não há mais resultados.
+            if len(jobs) < limit:
+                break
+
+
+async def _block_unneeded_requests(route, request):
+    """Aborta requisições que não influenciam o HTML da lista de vagas."""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host in request.url for host in BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """
+    Mantém o Playwright e o Chromium abertos durante a raspagem.
+    Deve ser usado com 'async with', que garante o fechamento do navegador.
+
+    Com ws_endpoint, conecta a um Chromium que já está rodando fora do
+    script (por exemplo, 'playwright run-server' ou um Browserless) e
+    reaproveita ele entre execuções, sem pagar a inicialização a cada vez.
+    Sem ws_endpoint, abre um Chromium novo para esta execução.
+    """
+
+    def __init__(self, ws_endpoint=None):
+        self._ws_endpoint = ws_endpoint
+
+    async def __aenter__(self):
+        self._pw = await async_playwright().start()
+        try:
+            if self._ws_endpoint:
+                self._browser = await self._pw.chromium.connect(self._ws_endpoint)
+            else:
+                self._browser = await self._pw.chromium.launch(
+                    headless=True, args=CHROMIUM_ARGS
+                )
+        except BaseException:
+            # Sem navegador o 'async with' não chega ao __aexit__,
+            # então o driver do Playwright precisa ser encerrado aqui.
+            await self._pw.stop()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # Quando conectado a um servidor, close() só desconecta;
+        # o Chromium remoto continua aberto para a próxima execução.
+        await self._browser.close()
+        await self._pw.stop()
+
+    async def new_context(self):
+        """Cria um contexto isolado (como uma aba anônima) no navegador aberto."""
+        context = await self._browser.new_context()
+        await context.route("**/*", _block_unneeded_requests)
+        return context
+
+
+def _iter_job_items(job_list_container):
+    """Percorre os <li> da lista de vagas sem montar uma lista intermediária."""
+    return (node for node in job_list_container.iter() if node.tag == "li")
+
+
+def extract_vagas_from_next_data(html):
+    """
+    Extrai as vagas do JSON que o Next.js embute na página
+    (<script id="__NEXT_DATA__">), sem percorrer o HTML.
+
+    O formato do blob não é documentado pela Gupy: espera-se uma lista em
+    props.pageProps.jobs com os mesmos campos da API (name, jobUrl e,
+    opcionalmente, city, state e workplaceType). Só confiamos nele se
+    todas as vagas tiverem name e jobUrl em texto; caso contrário, ou se a
+    lista vier vazia, devolve None para que o HTML seja percorrido.
+    """
+    match = NEXT_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        jobs = json.loads(match.group(1))["props"]["pageProps"]["jobs"]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if not jobs or not _is_job_list(jobs):
+        return None
+    return [_vaga_from_api_job(job) for job in jobs]
+
+
+def extract_vagas_from_html(html):
+    """
+    Extrai as vagas percorrendo os <li> da lista no HTML.
+    Devolve None se o container da lista não for encontrado.
+    """
+    # O backend lexbor do selectolax faz o parse e as buscas CSS em C,
+    # bem mais rápido e leve que montar a árvore do BeautifulSoup.
+    tree = LexborHTMLParser(html)
+    job_list_container = tree.css_first(JOB_LIST_SELECTOR)
+    if not job_list_container:
+        return None
+
+    vagas = []
+    for vaga_html in _iter_job_items(job_list_container):
+        titulo_tag = vaga_html.css_first("h3")
+        link_tag = vaga_html.css_first("a")
+        href = link_tag.attributes.get("href") if link_tag else None
+
+        if titulo_tag and href:
+            link = href
+            if not link.startswith("http"):
+                link = "https://portal.gupy.io" + link
+
+            location_tag = vaga_html.css_first(LOCATION_SELECTOR)
+            work_model_tag = vaga_html.css_first(WORK_MODEL_SELECTOR)
+
+            vagas.append({
+                "title": titulo_tag.text(strip=True),
+                "link": link,
+                "location": location_tag.text(strip=True) if location_tag else "Não informado",
+                "work_model": work_model_tag.text(strip=True) if work_model_tag else "Não informado",
+            })
+    return vagas
+
+
+async def scrape_gupy(pool, url, queue, max_pages=5):
+    """
+    Raspa o site da Gupy, navegando entre as páginas, extrai os detalhes 
+    das vagas e coloca as vagas de cada página na fila.
+    
+    :param pool: O BrowserPool com o Chromium já aberto ou conectado.
+    :param url: A URL inicial da busca.
+    :param queue: A fila onde cada lote de vagas é colocado.
+    :param max_pages: O número máximo de páginas para raspar.
+    """
+    print("Iniciando o scraper da Gupy com suporte a paginação...")
+    # Links já vistos nesta execução, caso a paginação repita alguma vaga.
+    seen_this_run = set()
+    
+    try:
+        # Cada raspagem usa um contexto novo (cookies e cache isolados)
+        # dentro do Chromium do pool.
+        context = await pool.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(url, timeout=60000)
+
+            page_count = 1
+            while page_count <= max_pages:
+                print(f"\n--- Raspando a página {page_count} ---")
+
+                # Espera até a lista de vagas estar de fato preenchida,
+                # em vez de dormir um tempo fixo "para garantir".
+                await page.wait_for_function(WAIT_JS, timeout=30000)
+
+                html = await page.content()
+                # O JSON do Next.js só reflete a página carregada pelo
+                # servidor; depois de clicar em "Próxima" ele fica desatualizado.
+                vagas_extraidas = None
+                if page_count == 1:
+                    vagas_extraidas = extract_vagas_from_next_data(html)
+                if vagas_extraidas is None:
+                    vagas_extraidas = extract_vagas_from_html(html)
+
+                if vagas_extraidas is None:
+                    print("Container de vagas não encontrado na página. Saindo...")
+                    break
+
+                print(f"Processadas {len(vagas_extraidas)} vagas encontradas na página atual.")
+                vagas_da_pagina = []
+                for vaga_data in vagas_extraidas:
+                    if vaga_data["link"] in seen_this_run:
+                        continue
+                    seen_this_run.add(vaga_data["link"])
+                    vagas_da_pagina.append(vaga_data)
+
+                # Entrega a página para o envio antes de ir para a próxima.
+                await queue.put(vagas_da_pagina)
+
+                # --- LÓGICA DE PAGINAÇÃO ---
+                # Procura o botão "Próxima página"
+                next_button_selector = 'button[aria-label="Next page"]'
+                next_button = await page.query_selector(next_button_selector)
+
+                print(f"DEBUG: Botão 'Próxima' encontrado? {bool(next_button)}")
+
+                # Verifica se o botão existe e se NÃO está desativado
+                if next_button and not await next_button.is_disabled():
+                    print("Encontrado botão 'Próxima página'. Clicando...")
+                    links_anteriores = await page.evaluate(JOB_LINKS_JS)
+                    await next_button.click()
+                    page_count += 1
+                    # A nova página está pronta quando os links da lista
+                    # deixam de ser os mesmos de antes do clique.
+                    try:
+                        await page.wait_for_function(
+                            PAGE_CHANGED_JS, arg=links_anteriores, timeout=30000
+                        )
+                    except PlaywrightTimeoutError:
+                        # Não encerra a raspagem por isso: a página seguinte
+                        # é lida mesmo assim e vagas repetidas são descartadas.
+                        print("A lista de vagas não mudou após o clique. Seguindo mesmo assim...")
+                else:
+                    print("Não há mais páginas ou o botão 'Próxima página' está desativado. Finalizando a raspagem.")
+                    break # Sai do loop while
+        finally:
+            await context.close()
+            
+    except Exception as e:
+        # O que já foi colocado na fila continua valendo.
+        print(f"Ocorreu um erro inesperado no Playwright: {e}")